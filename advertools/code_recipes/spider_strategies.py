@@ -276,7 +276,7 @@ used:
 
 
 ====  ============================  =================  =====================================  ===================
-  ..  proxy                           _rotating_proxy  request_headers_proxy-authorization      proxy_retry_times
+  ..  proxy                           _rotating_proxy  request_headers_Proxy-Authorization      proxy_retry_times
 ====  ============================  =================  =====================================  ===================
    0  https://123.456.789.101:8893                  1  Basic b3VzY214dHg6ODlld29rMGRsdfgt                     nan
    1  https://123.456.789.101:8894                  1  Basic b3VzY214dHg6ODlld29rMGRsdfgt                     nan
@@ -315,7 +315,7 @@ crawling. In the crawl DataFrame, simply use the regex pattern
     crawldf.filter(regex="request_headers_")
 
 ====  =================================  =================================  ============================
-  ..  request_headers_accept-language    request_headers_accept-encoding    request_headers_user-agent
+  ..  request_headers_Accept-Language    request_headers_Accept-Encoding    request_headers_User-Agent
 ====  =================================  =================================  ============================
    0  es                                 gzip, deflate                      advertools/0.13.2
 ====  =================================  =================================  ============================
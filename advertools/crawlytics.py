@@ -548,6 +548,11 @@ def jl_subset(filepath, columns=None, regex=None, chunksize=500):
     return final_df
 
 
+def _to_str_keep_na(column):
+    """Convert the values of ``column`` to strings, keeping nulls as nulls."""
+    return column.where(column.isna(), column.astype(str))
+
+
 def jl_to_parquet(jl_filepath, parquet_filepath):
     """Convert a jsonlines crawl file to the parquet format.
 
@@ -563,8 +568,17 @@ def jl_to_parquet(jl_filepath, parquet_filepath):
     >>> import advertools as adv
     >>> adv.crawlytics.jl_to_parquet("output_file.jl", "output_file.parquet")
     """
-    status = "not done"
     crawldf = pd.read_json(jl_filepath, lines=True)
+    try:
+        crawldf.to_parquet(parquet_filepath, index=False, version="2.6")
+        return
+    except Exception:
+        # convert all mixed-type columns at once, instead of discovering them
+        # one failed write at a time
+        for column in crawldf.select_dtypes("object"):
+            if crawldf[column].dropna().map(type).nunique() > 1:
+                crawldf[column] = _to_str_keep_na(crawldf[column])
+    status = "not done"
     while status == "not done":
         try:
             crawldf.to_parquet(parquet_filepath, index=False, version="2.6")
@@ -573,7 +587,7 @@ def jl_to_parquet(jl_filepath, parquet_filepath):
             error = e.args[-1]
             column = re.findall(r"column (\S+)", error)
             print(f"converting to string: {column[0]}")
-            crawldf[column[0]] = crawldf[column[0]].astype(str).replace("nan", pd.NA)
+            crawldf[column[0]] = _to_str_keep_na(crawldf[column[0]])
 
 
 def parquet_columns(filepath):
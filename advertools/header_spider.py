@@ -36,7 +36,7 @@ URLs and a file path where you want to save the output (in `.jl` format):
 
 
 ====  ============================================  ===================  ========  ==================  =========================  ==================  =======  ==========  ======  =============================  =====================  =============================  ===========================  ===============================  ===============================================================  =================================  ============================  =================================  ===================  ================  ==============  =================================  ==================  ============================================================================  ===============================  =============================  ====================================  =======================  ========================  ============================  ============================  ==========================================  ===========================  ===================================  ===================================  ==============================  =================================  ============================================  ==============================  ==================  =============================  ============================  =======================================================================================  =====================  ===========================================  ==================
-  ..  url                                           crawl_time             status    download_timeout  download_slot                download_latency    depth  protocol      body    resp_headers_content-length  resp_headers_server    resp_headers_date              resp_headers_content-type    resp_headers_content-encoding    request_headers_accept                                           request_headers_accept-language    request_headers_user-agent    request_headers_accept-encoding    resp_headers_vary      redirect_times    redirect_ttl  redirect_urls                        redirect_reasons  resp_headers_x-amz-id-2                                                       resp_headers_x-amz-request-id    resp_headers_last-modified     resp_headers_etag                     resp_headers_x-served    resp_headers_x-backend    resp_headers_x-rtd-project    resp_headers_x-rtd-version    resp_headers_x-rtd-path                     resp_headers_x-rtd-domain    resp_headers_x-rtd-version-method    resp_headers_x-rtd-project-method    resp_headers_referrer-policy    resp_headers_permissions-policy    resp_headers_strict-transport-security        resp_headers_cf-cache-status      resp_headers_age  resp_headers_expires           resp_headers_cache-control    resp_headers_expect-ct                                                                   resp_headers_cf-ray    resp_headers_alt-svc                         resp_headers_via
+  ..  url                                           crawl_time             status    download_timeout  download_slot                download_latency    depth  protocol      body    resp_headers_Content-Length  resp_headers_Server    resp_headers_Date              resp_headers_Content-Type    resp_headers_Content-Encoding    request_headers_Accept                                           request_headers_Accept-Language    request_headers_User-Agent    request_headers_Accept-Encoding    resp_headers_Vary      redirect_times    redirect_ttl  redirect_urls                        redirect_reasons  resp_headers_X-Amz-Id-2                                                       resp_headers_X-Amz-Request-Id    resp_headers_Last-Modified     resp_headers_Etag                     resp_headers_X-Served    resp_headers_X-Backend    resp_headers_X-Rtd-Project    resp_headers_X-Rtd-Version    resp_headers_X-Rtd-Path                     resp_headers_X-Rtd-Domain    resp_headers_X-Rtd-Version-Method    resp_headers_X-Rtd-Project-Method    resp_headers_Referrer-Policy    resp_headers_Permissions-Policy    resp_headers_Strict-Transport-Security        resp_headers_Cf-Cache-Status      resp_headers_Age  resp_headers_Expires           resp_headers_Cache-Control    resp_headers_Expect-Ct                                                                   resp_headers_Cf-Ray    resp_headers_Alt-Svc                         resp_headers_Via
 ====  ============================================  ===================  ========  ==================  =========================  ==================  =======  ==========  ======  =============================  =====================  =============================  ===========================  ===============================  ===============================================================  =================================  ============================  =================================  ===================  ================  ==============  =================================  ==================  ============================================================================  ===============================  =============================  ====================================  =======================  ========================  ============================  ============================  ==========================================  ===========================  ===================================  ===================================  ==============================  =================================  ============================================  ==============================  ==================  =============================  ============================  =======================================================================================  =====================  ===========================================  ==================
    0  https://adver.tools                           2022-02-11 02:32:26       200                 180  adver.tools                         0.0270483        0  HTTP/1.1       nan                              0  nginx/1.18.0 (Ubuntu)  Fri, 11 Feb 2022 02:32:26 GMT  text/html; charset=utf-8     gzip                             text/html,application/xhtml+xml,application/xml;q=0.9,...;q=0.8  en                                 advertools/0.13.0.rc2         gzip, deflate                      nan                               nan             nan  nan                                               nan  nan                                                                           nan                              nan                            nan                                   nan                      nan                       nan                           nan                           nan                                         nan                          nan                                  nan                                  nan                             nan                                nan                                           nan                                            nan  nan                            nan                           nan                                                                                      nan                    nan                                          nan
    1  https://povertydata.org                       2022-02-11 02:32:26       200                 180  povertydata.org                     0.06442          0  HTTP/1.1       nan                          13270  nginx/1.18.0 (Ubuntu)  Fri, 11 Feb 2022 02:32:26 GMT  text/html; charset=utf-8     gzip                             text/html,application/xhtml+xml,application/xml;q=0.9,...;q=0.8  en                                 advertools/0.13.0.rc2         gzip, deflate                      Accept-Encoding                   nan             nan  nan                                               nan  nan                                                                           nan                              nan                            nan                                   nan                      nan                       nan                           nan                           nan                                         nan                          nan                                  nan                                  nan                             nan                                nan                                           nan                                            nan  nan                            nan                           nan                                                                                      nan                    nan                                          nan
@@ -71,16 +71,16 @@ Here are some of the common reasons for using a ``HEAD`` crawler:
   the page in bytes. With images, it contains the size of the image. This can
   be an extremely efficient way of analyzing image sizes (and other meta data)
   without having to download those images, which could consume a lot of
-  bandwidth. Lookout for the column ``resp_headers_content-length``.
-* **Getting image types:** The ``resp_headers_content-type`` gives you an
+  bandwidth. Lookout for the column ``resp_headers_Content-Length``.
+* **Getting image types:** The ``resp_headers_Content-Type`` gives you an
   indication on the type of content of the page (or image when crawling image
   URLs); `text/html`, `image/jpeg` and `image/png` are some such content types.
 
 
 """  # noqa: E501
 
-import datetime
 import json
+import os
 import subprocess
 
 from scrapy import Request, Spider
@@ -89,7 +89,13 @@ from scrapy.exceptions import IgnoreRequest
 
 import advertools as adv
 from advertools import __version__ as adv_version
-from advertools.spider import MAX_CMD_LENGTH, _split_long_urllist
+from advertools.spider import (
+    MAX_CMD_LENGTH,
+    _crawl_time,
+    _headers_to_dict,
+    _meta_to_dict,
+    _split_long_urllist,
+)
 
 header_spider_path = adv.__path__[0] + "/header_spider.py"
 
@@ -108,7 +114,7 @@ class HeadersSpider(Spider):
 
     def __init__(self, url_list=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.start_urls = json.loads(json.dumps(url_list.split(",")))
+        self.start_urls = url_list.split(",")
 
     def start_requests(self):
         for url in self.start_urls:
@@ -122,7 +128,7 @@ class HeadersSpider(Spider):
     def errback(self, failure):
         if not failure.check(IgnoreRequest):
             self.logger.error(repr(failure))
-            now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            now = _crawl_time()
             yield {
                 "url": failure.request.url,
                 "crawl_time": now,
@@ -130,25 +136,16 @@ class HeadersSpider(Spider):
             }
 
     def parse(self, response):
-        now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        now = _crawl_time()
         yield {
             "url": response.url,
             "crawl_time": now,
             "status": response.status,
-            **{
-                k: "@@".join(str(val) for val in v) if isinstance(v, list) else v
-                for k, v in response.meta.items()
-            },
+            **_meta_to_dict(response.meta),
             "protocol": response.protocol,
             "body": response.text or None,
-            **{
-                "resp_headers_" + k: v
-                for k, v in response.headers.to_unicode_dict().items()
-            },
-            **{
-                "request_headers_" + k: v
-                for k, v in response.request.headers.to_unicode_dict().items()
-            },
+            **_headers_to_dict(response.headers, "resp_headers_"),
+            **_headers_to_dict(response.request.headers, "request_headers_"),
         }
 
 
@@ -201,34 +198,39 @@ def crawl_headers(url_list, output_file, custom_settings=None):
     """
     if isinstance(url_list, str):
         url_list = [url_list]
-    if output_file.rsplit(".")[-1] != "jl":
+    if not output_file.endswith(".jl"):
         raise ValueError(
             "Please make sure your output_file ends with '.jl'.\n"
             "For example:\n"
-            f"{output_file.rsplit('.', maxsplit=1)[0]}.jl"
+            f"{os.path.splitext(output_file)[0]}.jl"
         )
     settings_list = []
     if custom_settings is not None:
         for key, val in custom_settings.items():
             if isinstance(val, dict):
-                setting = "=".join([key, json.dumps(val)])
-            else:
-                setting = "=".join([key, str(val)])
-            settings_list.extend(["-s", setting])
+                val = json.dumps(val)
+            settings_list.extend(["-s", f"{key}={val}"])
 
     command = [
         "scrapy",
         "runspider",
         header_spider_path,
-        "-a",
-        "url_list=" + ",".join(url_list),
         "-o",
         output_file,
     ] + settings_list
-    if len(",".join(url_list)) > MAX_CMD_LENGTH:
-        split_urls = _split_long_urllist(url_list)
+    # length of ",".join(url_list), without building the string just to measure it
+    url_list_len = sum(len(url) + 1 for url in url_list) - 1
+    # the rest of the command counts towards the limit as well
+    command_len = sum(len(arg) + 1 for arg in command + ["-a", "url_list="])
+    max_len = MAX_CMD_LENGTH - command_len
+    if max_len <= 0:
+        raise ValueError(
+            "The command is too long to run, even without any URLs. "
+            "Please use a shorter output_file path or fewer custom_settings."
+        )
+    if url_list_len > max_len:
+        split_urls = _split_long_urllist(url_list, max_len=max_len)
         for u_list in split_urls:
-            command[4] = "url_list=" + ",".join(u_list)
-            subprocess.run(command)
+            subprocess.run(command + ["-a", "url_list=" + ",".join(u_list)])
     else:
-        subprocess.run(command)
+        subprocess.run(command + ["-a", "url_list=" + ",".join(url_list)])
@@ -144,7 +144,7 @@ readability):
     >>> import pandas as pd
     >>> site_crawl = pd.read_json('path/to/file.jl', lines=True)
     >>> site_crawl.head()
-                                   url                           title                       meta_desc                              h1                              h2                              h3                        body_text  size  download_timeout              download_slot  download_latency  redirect_times  redirect_ttl                   redirect_urls redirect_reasons  depth  status                      links_href                      links_text                         img_src                         img_alt    ip_address           crawl_time              resp_headers_date resp_headers_content-type     resp_headers_last-modified resp_headers_vary    resp_headers_x-ms-request-id resp_headers_x-ms-version resp_headers_x-ms-lease-status resp_headers_x-ms-blob-type resp_headers_access-control-allow-origin   resp_headers_x-served resp_headers_x-backend resp_headers_x-rtd-project resp_headers_x-rtd-version         resp_headers_x-rtd-path  resp_headers_x-rtd-domain resp_headers_x-rtd-version-method resp_headers_x-rtd-project-method resp_headers_strict-transport-security resp_headers_cf-cache-status  resp_headers_age           resp_headers_expires resp_headers_cache-control          resp_headers_expect-ct resp_headers_server   resp_headers_cf-ray      resp_headers_cf-request-id          request_headers_accept request_headers_accept-language      request_headers_user-agent request_headers_accept-encoding          request_headers_cookie
+                                   url                           title                       meta_desc                              h1                              h2                              h3                        body_text  size  download_timeout              download_slot  download_latency  redirect_times  redirect_ttl                   redirect_urls redirect_reasons  depth  status                      links_href                      links_text                         img_src                         img_alt    ip_address           crawl_time              resp_headers_Date resp_headers_Content-Type     resp_headers_Last-Modified resp_headers_Vary    resp_headers_X-Ms-Request-Id resp_headers_X-Ms-Version resp_headers_X-Ms-Lease-Status resp_headers_X-Ms-Blob-Type resp_headers_Access-Control-Allow-Origin   resp_headers_X-Served resp_headers_X-Backend resp_headers_X-Rtd-Project resp_headers_X-Rtd-Version         resp_headers_X-Rtd-Path  resp_headers_X-Rtd-Domain resp_headers_X-Rtd-Version-Method resp_headers_X-Rtd-Project-Method resp_headers_Strict-Transport-Security resp_headers_Cf-Cache-Status  resp_headers_Age           resp_headers_Expires resp_headers_Cache-Control          resp_headers_Expect-Ct resp_headers_Server   resp_headers_Cf-Ray      resp_headers_Cf-Request-Id          request_headers_Accept request_headers_Accept-Language      request_headers_User-Agent request_headers_Accept-Encoding          request_headers_Cookie
     0   https://advertools.readthedocs            advertools —  Python  Get productive as an online ma  advertools@@Indices and tables  Online marketing productivity                              NaN   Generate keywords for SEM camp   NaN               NaN  advertools.readthedocs.io               NaN             NaN           NaN  https://advertools.readthedocs            [302]    NaN     NaN  #@@readme.html@@advertools.kw_  @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@                             NaN                             NaN  104.17.32.82  2020-05-21 10:39:35  Thu, 21 May 2020 10:39:35 GMT                 text/html  Wed, 20 May 2020 12:26:23 GMT   Accept-Encoding  720a8581-501e-0043-01a2-2e77d2                2009-09-19                       unlocked                   BlockBlob                                        *  Nginx-Proxito-Sendfile              web00007c                 advertools                     master  /proxito/media/html/advertools  advertools.readthedocs.io                              path                         subdomain         max-age=31536000; includeSubDo                          HIT               NaN  Thu, 21 May 2020 11:39:35 GMT       public, max-age=3600  max-age=604800, report-uri="ht          cloudflare  596daca7dbaa7e9e-BUD  02d86a3cea00007e9edb0cf2000000  text/html,application/xhtml+xm                              en  Mozilla/5.0 (Windows NT 10.0;                    gzip, deflate  __cfduid=d76b68d148ddec1efd004
     1   https://advertools.readthedocs            advertools —  Python                             NaN                      advertools         Change Log - advertools  0.9.1 (2020-05-19)@@0.9.0 (202   Ability to specify robots.txt    NaN               NaN  advertools.readthedocs.io               NaN             NaN           NaN                             NaN              NaN    NaN     NaN  index.html@@readme.html@@adver  @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@                             NaN                             NaN  104.17.32.82  2020-05-21 10:39:36  Thu, 21 May 2020 10:39:35 GMT                 text/html  Wed, 20 May 2020 12:26:23 GMT   Accept-Encoding  4f7bea3b-701e-0039-3f44-2f1d9f                2009-09-19                       unlocked                   BlockBlob                                        *  Nginx-Proxito-Sendfile              web00007h                 advertools                     master  /proxito/media/html/advertools  advertools.readthedocs.io                              path                         subdomain         max-age=31536000; includeSubDo                          HIT               NaN  Thu, 21 May 2020 11:39:35 GMT       public, max-age=3600  max-age=604800, report-uri="ht          cloudflare  596daca9bcab7e9e-BUD  02d86a3e0e00007e9edb0d72000000  text/html,application/xhtml+xm                              en  Mozilla/5.0 (Windows NT 10.0;                    gzip, deflate  __cfduid=d76b68d148ddec1efd004
     2   https://advertools.readthedocs            advertools —  Python  Get productive as an online ma  advertools@@Indices and tables  Online marketing productivity                              NaN   Generate keywords for SEM camp   NaN               NaN  advertools.readthedocs.io               NaN             NaN           NaN                             NaN              NaN    NaN     NaN  #@@readme.html@@advertools.kw_  @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@                             NaN                             NaN  104.17.32.82  2020-05-21 10:39:36  Thu, 21 May 2020 10:39:35 GMT                 text/html  Wed, 20 May 2020 12:26:36 GMT   Accept-Encoding  98b729fa-e01e-00bf-24c3-2e494d                2009-09-19                       unlocked                   BlockBlob                                        *  Nginx-Proxito-Sendfile              web00007c                 advertools                     latest  /proxito/media/html/advertools  advertools.readthedocs.io                              path                         subdomain         max-age=31536000; includeSubDo                          HIT               NaN  Thu, 21 May 2020 11:39:35 GMT       public, max-age=3600  max-age=604800, report-uri="ht          cloudflare  596daca9bf26d423-BUD  02d86a3e150000d423322742000000  text/html,application/xhtml+xm                              en  Mozilla/5.0 (Windows NT 10.0;                    gzip, deflate  __cfduid=d76b68d148ddec1efd004
@@ -361,11 +361,31 @@ Here are some examples that you might find interesting:
   simultaneous requests to be performed for each domain. You might want to
   lower this if you don't want to put too much pressure on the website's
   server, and you probably don't want to get blocked!
+* `AUTOTHROTTLE_ENABLED`, `AUTOTHROTTLE_TARGET_CONCURRENCY` Instead of fixing
+  the concurrency and delay yourself, you can let the crawler adjust the delay
+  for each website based on how fast its server responds. It speeds up while
+  the server keeps up, slows down when responses take longer, and never
+  speeds up because of error responses. `AUTOTHROTTLE_TARGET_CONCURRENCY` is
+  the average number of parallel requests it aims for (it is still capped by
+  `CONCURRENT_REQUESTS_PER_DOMAIN`). This works well for crawling many URLs of
+  the same website in list mode.
 * `DEFAULT_REQUEST_HEADERS` You can change this if you need to.
 * `DEPTH_LIMIT` How deep your crawl will be allowed. The default has no limit.
 * `DOWNLOAD_DELAY` Similar to the first option. Controls the amount of time in
   seconds for the crawler to wait between consecutive pages of the same
   website. It can also take fractions of a second (0.4, 0.75, etc.)
+* `DOWNLOAD_MAXSIZE`, `DOWNLOAD_WARNSIZE` The maximum response size (in bytes)
+  that the crawler will download, and the size above which it logs a warning.
+  Compressed (gzip, br, etc.) responses are decompressed in chunks and checked
+  against the same limits (Scrapy 2.11.1+), so a very large page is dropped
+  before it is fully held in memory. Useful if you want to skip huge files
+  (large PDFs for example) that might be linked from the crawled pages.
+* `DOWNLOAD_HANDLERS` Set this to
+  ``{"https": "scrapy.core.downloader.handlers.http2.H2DownloadHandler"}`` to
+  crawl HTTPS websites over HTTP/2, where many requests to the same website
+  share one connection. This can help when crawling many URLs of a few
+  websites. It requires installing ``Twisted[http2]``, and does not work with
+  proxies, so it is not enabled by default.
 * `LOG_FILE` If you want to save your crawl logs to a file, which is strongly
   recommended, you can provide a path to it here.
 * `USER_AGENT` If you want to identify yourself differently while crawling.
@@ -403,30 +423,30 @@ for the full details.
 
 """  # noqa: E501
 
-import datetime
+import ast
 import json
 import logging
+import os
 import platform
 import re
 import runpy
 import subprocess
-from urllib.parse import parse_qs, urlparse, urlsplit
+import tempfile
+import time
+from collections import defaultdict
+from functools import lru_cache, partial
+from urllib.parse import parse_qs, urlsplit
 
-import pandas as pd
 import scrapy
 import scrapy.logformatter as formatter
-from scrapy import Request
+from lxml import etree
+from parsel import css2xpath
+from scrapy import Request, Selector
 from scrapy.linkextractors import LinkExtractor
 from scrapy.spiders import Spider
 from scrapy.utils.response import get_base_url
 
 import advertools as adv
-
-if int(pd.__version__[0]) >= 1:
-    from pandas import json_normalize
-else:
-    from pandas.io.json import json_normalize
-
 from advertools import __version__ as adv_version
 
 spider_path = adv.__path__[0] + "/spider.py"
@@ -436,28 +456,35 @@ user_agent = f"advertools/{adv_version}"
 # BODY_TEXT_SELECTOR = "//body//span//text() | //body//p//text() | //body//li//text()"
 BODY_TEXT_SELECTOR = "//body//*[self::a or self::abbr or self::address or self::b or self::blockquote or self::cite or self::code or self::dd or self::del or self::div or self::dl or self::dt or self::em or self::h1 or self::h2 or self::h3 or self::h4 or self::h5 or self::h6 or self::header or self::i or self::ins or self::kbd or self::li or self::mark or self::ol or self::p or self::pre or self::q or self::section or self::small or self::span or self::strong or self::sub or self::sup or self::time or self::u or self::ul][not(ancestor::area) and not(ancestor::aside) and not(ancestor::audio) and not(ancestor::button) and not(ancestor::caption) and not(ancestor::col) and not(ancestor::colgroup) and not(ancestor::datalist) and not(ancestor::details) and not(ancestor::embed) and not(ancestor::fieldset) and not(ancestor::footer) and not(ancestor::form) and not(ancestor::head) and not(ancestor::iframe) and not(ancestor::img) and not(ancestor::input) and not(ancestor::label) and not(ancestor::legend) and not(ancestor::link) and not(ancestor::map) and not(ancestor::meta) and not(ancestor::nav) and not(ancestor::noscript) and not(ancestor::object) and not(ancestor::optgroup) and not(ancestor::option) and not(ancestor::output) and not(ancestor::param) and not(ancestor::picture) and not(ancestor::script) and not(ancestor::select) and not(ancestor::source) and not(ancestor::style) and not(ancestor::svg) and not(ancestor::table) and not(ancestor::tbody) and not(ancestor::td) and not(ancestor::textarea) and not(ancestor::tfoot) and not(ancestor::th) and not(ancestor::thead) and not(ancestor::title) and not(ancestor::tr) and not(ancestor::track) and not(ancestor::video)]/text()"  # noqa: E501
 
-_IMG_ATTRS = {
-    "alt",
-    "crossorigin",
-    "decoding",
-    "fetchpriority",
-    "height",
-    "ismap",
-    "loading",
-    "referrerpolicy",
-    "sizes",
-    "src",
-    "srcset",
-    "usemap",
-    "width",
-    # Depracated tags, also included for completeness and QA:
-    "align",
-    "border",
-    "hspace",
-    "longdesc",
-    "name",
-    "vspace",
-}
+_IMG_ATTRS = frozenset(
+    {
+        "alt",
+        "crossorigin",
+        "decoding",
+        "fetchpriority",
+        "height",
+        "ismap",
+        "loading",
+        "referrerpolicy",
+        "sizes",
+        "src",
+        "srcset",
+        "usemap",
+        "width",
+        # Depracated tags, also included for completeness and QA:
+        "align",
+        "border",
+        "hspace",
+        "longdesc",
+        "name",
+        "vspace",
+    }
+)
+
+
+def _url_query_keys(url):
+    """Get the names of the query parameters of ``url`` as a frozenset."""
+    return frozenset(parse_qs(urlsplit(url).query))
 
 
 def _crawl_or_not(
@@ -467,46 +494,83 @@ def _crawl_or_not(
     exclude_url_regex=None,
     include_url_regex=None,
 ):
-    qs = parse_qs(urlsplit(url).query)
-    supplied_conditions = []
-    if exclude_url_params is not None:
-        if exclude_url_params is True and qs:
+    if exclude_url_params is not None or include_url_params is not None:
+        # a URL without "?" has no query string to parse
+        qs = _url_query_keys(url) if "?" in url else frozenset()
+        if exclude_url_params is True:
+            if qs:
+                return False
+        elif exclude_url_params is not None and not qs.isdisjoint(exclude_url_params):
             return False
-        if exclude_url_params is True and not qs:
-            pass
-        else:
-            exclude_params_in_url = not bool(set(exclude_url_params).intersection(qs))
-            supplied_conditions.append(exclude_params_in_url)
+        if include_url_params is not None and qs.isdisjoint(include_url_params):
+            return False
+
+    if exclude_url_regex is not None and re.search(exclude_url_regex, url):
+        return False
 
-    if include_url_params is not None:
-        include_params_in_url = bool(set(include_url_params).intersection(qs))
-        supplied_conditions.append(include_params_in_url)
+    if include_url_regex is not None and not re.search(include_url_regex, url):
+        return False
+    return True
 
-    if exclude_url_regex is not None:
-        exclude_pattern_matched = not bool(re.findall(exclude_url_regex, url))
-        supplied_conditions.append(exclude_pattern_matched)
 
-    if include_url_regex is not None:
-        include_pattern_matched = bool(re.findall(include_url_regex, url))
-        supplied_conditions.append(include_pattern_matched)
-    return all(supplied_conditions)
+_BODY_TEXT_TAGS = frozenset(re.findall(r"self::(\w+)", BODY_TEXT_SELECTOR))
+_BODY_TEXT_SKIP_TAGS = frozenset(re.findall(r"ancestor::(\w+)", BODY_TEXT_SELECTOR))
+
+
+def _extract_body_text(root):
+    """Get the same text nodes as ``BODY_TEXT_SELECTOR`` in a single tree walk.
+
+    Subtrees of excluded tags are skipped as soon as they are entered, instead
+    of checking every ancestor of every candidate element.
+    """
+    text = []
+    for body in root.iter("body"):
+        # whether each open element is one whose text should be collected
+        collect = [False]
+        walker = etree.iterwalk(body, events=("start", "end", "comment", "pi"))
+        next(walker)
+        for event, el in walker:
+            if event == "start":
+                if el.tag in _BODY_TEXT_SKIP_TAGS:
+                    walker.skip_subtree()
+                    collect.append(False)
+                    continue
+                include = el.tag in _BODY_TEXT_TAGS
+                collect.append(include)
+                if include and el.text is not None:
+                    text.append(el.text)
+            elif event == "end":
+                collect.pop()
+                if collect and collect[-1] and el.tail is not None:
+                    text.append(el.tail)
+            elif collect[-1] and el.tail is not None:
+                text.append(el.tail)
+    return text
+
+
+_IMG_XPATH = etree.XPath("//img")
 
 
 def _extract_images(response):
-    page_has_images = response.xpath("//img")
-    if page_has_images:
-        img_df = pd.DataFrame([x.attrib for x in response.xpath("//img")])
-        if "src" in img_df:
-            img_df["src"] = [
-                response.urljoin(url) if isinstance(url, str) else url
-                for url in img_df["src"]
+    images = [img.attrib for img in _IMG_XPATH(response.selector.root)]
+    if not images:
+        return {}
+    attrs = {}
+    for attrib in images:
+        for attr in attrib:
+            if attr in _IMG_ATTRS:
+                attrs[attr] = None
+    d = {}
+    for attr in attrs:
+        if attr == "src":
+            values = [
+                response.urljoin(attrib["src"]) if "src" in attrib else ""
+                for attrib in images
             ]
-        img_df = img_df.apply(lambda col: col.fillna("").str.cat(sep="@@")).to_frame().T
-        img_df = img_df[img_df.columns.intersection(_IMG_ATTRS)]
-        img_df = img_df.add_prefix("img_")
-        d = img_df.to_dict("records")[0]
-        return d
-    return {}
+        else:
+            values = [attrib.get(attr, "") for attrib in images]
+        d["img_" + attr] = "@@".join(values)
+    return d
 
 
 def get_max_cmd_len():
@@ -524,10 +588,19 @@ formatter.DROPPEDMSG = "Dropped: %(exception)s"
 formatter.DOWNLOADERRORMSG_LONG = "Error downloading %(request)s"
 
 
+@lru_cache(maxsize=None)
+def _sections_xpath(sections):
+    return etree.XPath(" | ".join("//" + section for section in sections))
+
+
 class MyLinkExtractor(LinkExtractor):
     def extract_links(self, response):
         base_url = get_base_url(response)
-        if self.restrict_xpaths:
+        if len(self.restrict_xpaths) == 1:
+            docs = response.xpath(self.restrict_xpaths[0])
+        elif self.restrict_xpaths:
+            # not combined with " | " as that would return the matches in
+            # document order, rather than in the order of restrict_xpaths
             docs = [
                 subdoc for x in self.restrict_xpaths for subdoc in response.xpath(x)
             ]
@@ -539,129 +612,478 @@ class MyLinkExtractor(LinkExtractor):
             all_links.extend(self._process_links(links))
         return all_links
 
+    def extract_section_links(
+        self, response, sections=("nav", "header", "footer"), base_url=None
+    ):
+        """Extract the links within each of the ``sections`` tags.
+
+        All sections are selected with one XPath union instead of one document
+        traversal per tag. Returns a dict mapping each tag to its list of links.
+        """
+        if base_url is None:
+            base_url = get_base_url(response)
+        section_links = {section: [] for section in sections}
+        for section in _sections_xpath(tuple(sections))(response.selector.root):
+            doc = Selector(root=section, type="html")
+            links = self._extract_links(doc, response.url, response.encoding, base_url)
+            section_links[section.tag].extend(self._process_links(links))
+        return section_links
+
+    def extract_page_links(self, response, sections=("nav", "header", "footer")):
+        """Extract all links of the page, and the links within ``sections``.
+
+        Returns a dict with the page's links under "links", and the links of
+        each section under its tag name, resolving the base URL only once.
+        """
+        base_url = get_base_url(response)
+        links = self._extract_links(
+            response.selector, response.url, response.encoding, base_url
+        )
+        page_links = {"links": self._process_links(links)}
+        page_links.update(self.extract_section_links(response, sections, base_url))
+        return page_links
+
 
 le = MyLinkExtractor(unique=False)
-le_nav = MyLinkExtractor(unique=False, restrict_xpaths="//nav")
-le_header = MyLinkExtractor(unique=False, restrict_xpaths="//header")
-le_footer = MyLinkExtractor(unique=False, restrict_xpaths="//footer")
 
-crawl_headers = {
-    "url",
-    "title",
-    "meta_desc",
-    "viewport",
-    "charset",
-    "alt_href",
-    "alt_hreflang",
-    "h1",
-    "h2",
-    "h3",
-    "h4",
-    "h5",
-    "h6",
-    "canonical",
-    "body_text",
-    "size",
-    "download_timeout",
-    "download_slot",
-    "download_latency",
-    "redirect_times",
-    "redirect_ttl",
-    "redirect_urls",
-    "redirect_reasons",
-    "depth",
-    "status",
-    "links_url",
-    "links_text",
-    "links_nofollow",
-    "img_src",
-    "img_alt",
-    "ip_address",
-    "crawl_time",
-    "blocked_by_robotstxt",
-    "jsonld_errors",
-    "request_headers_accept",
-    "request_headers_accept-language",
-    "request_headers_user-agent",
-    "request_headers_accept-encoding",
-    "request_headers_cookie",
-}
+crawl_headers = frozenset(
+    {
+        "url",
+        "title",
+        "meta_desc",
+        "viewport",
+        "charset",
+        "alt_href",
+        "alt_hreflang",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "canonical",
+        "body_text",
+        "size",
+        "download_timeout",
+        "download_slot",
+        "download_latency",
+        "redirect_times",
+        "redirect_ttl",
+        "redirect_urls",
+        "redirect_reasons",
+        "depth",
+        "status",
+        "links_url",
+        "links_text",
+        "links_nofollow",
+        "img_src",
+        "img_alt",
+        "ip_address",
+        "crawl_time",
+        "blocked_by_robotstxt",
+        "jsonld_errors",
+        "request_headers_Accept",
+        "request_headers_Accept-Language",
+        "request_headers_User-Agent",
+        "request_headers_Accept-Encoding",
+        "request_headers_Cookie",
+    }
+)
+
+# columns whose values are copied from response.meta, so setting them in ``meta``
+# is how Scrapy expects them to be changed (download_timeout for example)
+_META_COLUMNS = frozenset(
+    {
+        "download_timeout",
+        "download_slot",
+        "download_latency",
+        "redirect_times",
+        "redirect_ttl",
+        "redirect_urls",
+        "redirect_reasons",
+        "depth",
+    }
+)
+
+# every fixed column of the crawled pages
+_PAGE_COLUMNS = (
+    crawl_headers
+    | {
+        f"{section}links_{field}"
+        for section in ("", "nav_", "header_", "footer_")
+        for field in ("url", "text", "nofollow")
+    }
+    | {f"img_{attr}" for attr in _IMG_ATTRS}
+)
+
+# og:, twitter:, JSON-LD, and header columns depend on each page
+_PAGE_COLUMN_PREFIXES = (
+    "og:",
+    "twitter:",
+    "jsonld_",
+    "resp_headers_",
+    "request_headers_",
+)
+
+
+def _page_column_clashes(keys):
+    """Get the ``keys`` that would overwrite a column extracted from every page."""
+    return sorted(
+        key
+        for key in keys
+        if key in _PAGE_COLUMNS or key.startswith(_PAGE_COLUMN_PREFIXES)
+    )
 
 
 def _split_long_urllist(url_list, max_len=MAX_CMD_LENGTH):
-    """Split url_list if their total length is greater than MAX_CMD_LENGTH."""
-    split_list = [[]]
+    """Split url_list if their total length is greater than MAX_CMD_LENGTH.
 
+    The length of each chunk includes the commas it is joined with.
+    """
+    split_list = [[]]
+    temp_len = 0
     for u in url_list:
-        temp_len = sum(len(temp_u) for temp_u in split_list[-1])
-        if (temp_len < max_len) and (temp_len + len(u) < max_len):
+        u_len = len(u)
+        # a URL longer than max_len gets a chunk of its own, and a new chunk is
+        # only started after a non-empty one
+        if temp_len + u_len < max_len or not split_list[-1]:
             split_list[-1].append(u)
+            temp_len += u_len + 1
         else:
             split_list.append([u])
+            temp_len = u_len + 1
     return split_list
 
 
+def _write_list_file(values):
+    """Write ``values`` to a temporary file, one per line, and return its path."""
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", encoding="utf-8", newline="", delete=False
+    ) as file:
+        file.write("\n".join(values))
+    return file.name
+
+
+def _read_list_file(filepath):
+    """Read back the values written by ``_write_list_file``.
+
+    newline="" and split("\n"), so that values containing other line-breaking
+    characters (\r, \x85, etc.) are not split.
+    """
+    with open(filepath, encoding="utf-8", newline="") as file:
+        return file.read().split("\n")
+
+
 def _numbered_duplicates(items):
-    """Append a number to all duplicated items starting at 1.
+    """Append a number to the repeated occurrences of duplicated items.
 
     ['og:site', 'og:image', 'og:image', 'og:type', 'og:image']
     becomes:
-    ['og:site', 'og:image_1', 'og:image_2', 'og:type', 'og:image_3']
+    ['og:site', 'og:image', 'og:image_1', 'og:type', 'og:image_2']
     """
-    item_count = dict.fromkeys(items, 0)
+    item_count = {}
     numbered_items = []
     for item in items:
-        numbered_items.append(item + "_" + str(item_count[item]))
-        item_count[item] += 1
-    for i, num_item in enumerate(numbered_items):
-        split_number = num_item.rsplit("_", maxsplit=1)
-        if split_number[1] == "0":
-            numbered_items[i] = split_number[0]
+        count = item_count.get(item, 0)
+        numbered_items.append(item + "_" + str(count) if count else item)
+        item_count[item] = count + 1
     return numbered_items
 
 
+def _flatten_json(obj, key_prefix="", flat=None):
+    """Flatten nested dicts joining keys with ".", like json_normalize does."""
+    if flat is None:
+        flat = {}
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            key = f"{key_prefix}.{key}" if key_prefix else str(key)
+            _flatten_json(value, key, flat)
+    else:
+        flat[key_prefix] = obj
+    return flat
+
+
+def _normalize_json_row(row):
+    # like json_normalize: top-level non-dict values first, then flattened dicts
+    if not isinstance(row, dict):
+        return {}
+    flat = {key: value for key, value in row.items() if not isinstance(value, dict)}
+    nested = {key: value for key, value in row.items() if isinstance(value, dict)}
+    flat.update(_flatten_json(nested))
+    return flat
+
+
+def _column_kind(values):
+    # the dtype pandas would infer for a column holding ``values``
+    if all(
+        v is None or (isinstance(v, (int, float)) and not isinstance(v, bool))
+        for v in values
+    ):
+        if all(v is None for v in values):
+            return "object"
+        if all(isinstance(v, int) for v in values):
+            return "int"
+        return "float"
+    if all(isinstance(v, bool) for v in values):
+        return "bool"
+    return "object"
+
+
 def _json_to_dict(jsonobj, i=None):
+    """Flatten a JSON-LD object into "jsonld_" prefixed keys.
+
+    Gives the first row of ``json_normalize(jsonobj)`` (with the same column
+    order and type conversions), without building a DataFrame for every page.
+    """
     try:
-        df = json_normalize(jsonobj)
-        if i:
-            df = df.add_prefix("jsonld_{}_".format(i))
+        if isinstance(jsonobj, list):
+            rows = [_normalize_json_row(row) for row in jsonobj]
+            if not rows:
+                raise ValueError("JSON-LD list is empty")
         else:
-            df = df.add_prefix("jsonld_")
-        return dict(zip(df.columns, df.values[0]))
+            rows = [_normalize_json_row(jsonobj)]
+        columns = {}
+        for row in rows:
+            for key in row:
+                columns.setdefault(key, [])
+        for key, values in columns.items():
+            values.extend(row.get(key, float("nan")) for row in rows)
+        kinds = {key: _column_kind(values) for key, values in columns.items()}
+        numeric = set(kinds.values()) <= {"int", "float"}
+        as_float = numeric and "float" in kinds.values()
+        prefix = "jsonld_{}_".format(i) if i else "jsonld_"
+        d = {}
+        for key, values in columns.items():
+            value = values[0]
+            if kinds[key] == "float" or as_float:
+                value = float("nan") if value is None else float(value)
+            d[prefix + key] = value
+        return d
     except Exception as e:
         logger = logging.getLogger(__name__)
         logger.error(msg=str(e))
         return {}
 
 
-tags_xpaths = {
-    "title": "//title/text()",
-    "meta_desc": '//meta[@name="description"]/@content',
-    "viewport": '//meta[@name="viewport"]/@content',
-    "charset": "//meta[@charset]/@charset",
-    "h1": "//h1",
-    "h2": "//h2",
-    "h3": "//h3",
-    "h4": "//h4",
-    "h5": "//h5",
-    "h6": "//h6",
-    "canonical": '//link[@rel="canonical"]/@href',
-    "alt_href": '//link[@rel="alternate"]/@href',
-    "alt_hreflang": '//link[@rel="alternate"]/@hreflang',
-}
+def _headers_to_dict(headers, prefix):
+    """Convert Scrapy ``Headers`` to a dict, adding ``prefix`` to header names.
+
+    Same keys and values as ``headers.to_unicode_dict()`` on Scrapy 2.10+, where
+    header names keep Scrapy's title case ("Content-Type") and multiple values
+    are joined with a comma, without building the intermediate dict.
+    """
+    encoding = headers.encoding
+    return {
+        prefix + key.decode(encoding): b",".join(values).decode(encoding)
+        for key, values in headers.items()
+    }
+
+
+def _meta_to_dict(meta):
+    """Copy ``meta`` for the output, joining list values with "@@"."""
+    return {
+        key: "@@".join(map(str, value)) if isinstance(value, list) else value
+        for key, value in meta.items()
+    }
+
+
+_NOFOLLOW_STR = {True: "True", False: "False"}
+
+
+def _flatten_links(links, prefix):
+    """Join the url, text, and nofollow values of ``links`` in a single pass."""
+    if not links:
+        return {}
+    urls = []
+    texts = []
+    nofollow = []
+    for link in links:
+        urls.append(link.url)
+        texts.append(link.text)
+        nofollow.append(_NOFOLLOW_STR[link.nofollow])
+    return {
+        prefix + "_url": "@@".join(urls),
+        prefix + "_text": "@@".join(texts),
+        prefix + "_nofollow": "@@".join(nofollow),
+    }
 
 
-def _extract_content(resp, **tags_xpaths):
+def _load_jsonld(script):
+    """Parse a JSON-LD script, dropping raw line breaks only if it is invalid.
+
+    Raw line breaks inside strings are invalid JSON but common in the wild, so
+    those scripts are retried with CR removed and LF replaced by a space.
+    """
+    try:
+        return json.loads(script)
+    except json.JSONDecodeError:
+        return json.loads(script.replace("\r", "").replace("\n", " "))
+
+
+# the columns of _extract_content, in output order
+_CONTENT_COLUMNS = (
+    "title",
+    "meta_desc",
+    "viewport",
+    "charset",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "canonical",
+    "alt_href",
+    "alt_hreflang",
+)
+
+_HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+def _extract_head_tags(root):
+    """Collect the title, meta, link, and JSON-LD values in a single tree walk.
+
+    Returns lists with the same values, in the same order, as these XPath
+    expressions:
+
+    ============  ===================================================
+    title         //title/text()
+    meta_desc     //meta[@name="description"]/@content
+    viewport      //meta[@name="viewport"]/@content
+    charset       //meta[@charset]/@charset
+    og_props      //meta[starts-with(@property, "og:")]/@property
+    og_content    //meta[starts-with(@property, "og:")]/@content
+    twtr_names    //meta[starts-with(@name, "twitter:")]/@name
+    twtr_content  //meta[starts-with(@name, "twitter:")]/@content
+    canonical     //link[@rel="canonical"]/@href
+    alt_href      //link[@rel="alternate"]/@href
+    alt_hreflang  //link[@rel="alternate"]/@hreflang
+    jsonld        //script[@type="application/ld+json"]/text()
+    ============  ===================================================
+    """
+    found = defaultdict(list)
+    for el in root.iter("title", "meta", "link", "script"):
+        tag = el.tag
+        if tag == "meta":
+            name = el.get("name")
+            content = el.get("content")
+            if content is not None:
+                if name == "description":
+                    found["meta_desc"].append(content)
+                elif name == "viewport":
+                    found["viewport"].append(content)
+            charset = el.get("charset")
+            if charset is not None:
+                found["charset"].append(charset)
+            prop = el.get("property")
+            if prop is not None and prop.startswith("og:"):
+                found["og_props"].append(prop)
+                if content is not None:
+                    found["og_content"].append(content)
+            if name is not None and name.startswith("twitter:"):
+                found["twtr_names"].append(name)
+                if content is not None:
+                    found["twtr_content"].append(content)
+        elif tag == "link":
+            rel = el.get("rel")
+            if rel == "canonical":
+                href = el.get("href")
+                if href is not None:
+                    found["canonical"].append(href)
+            elif rel == "alternate":
+                href = el.get("href")
+                if href is not None:
+                    found["alt_href"].append(href)
+                hreflang = el.get("hreflang")
+                if hreflang is not None:
+                    found["alt_hreflang"].append(hreflang)
+        elif tag == "title":
+            # all text nodes that are direct children, like title/text()
+            texts = [el.text] + [child.tail for child in el]
+            found["title"].extend(text for text in texts if text is not None)
+        elif el.get("type") == "application/ld+json" and el.text is not None:
+            found["jsonld"].append(el.text)
+    return found
+
+
+def _extract_content(root, head_tags=None):
+    if head_tags is None:
+        head_tags = _extract_head_tags(root)
+    # all headings in one walk, bucketed by tag in document order, like //h1 etc.
+    headings = {tag: [] for tag in _HEADINGS}
+    for h in root.iter(*_HEADINGS):
+        headings[h.tag].append(h.text_content())
     d = {}
-    for tag, xpath in tags_xpaths.items():
-        if not tag.startswith("h"):
-            value = "@@".join(resp.xpath(xpath).getall())
-            if value:
-                d.update({tag: value})
+    for tag in _CONTENT_COLUMNS:
+        value = "@@".join(headings[tag] if tag in headings else head_tags.get(tag, []))
+        if value:
+            d[tag] = value
+    return d
+
+
+@lru_cache(maxsize=1)
+def _format_crawl_time(seconds):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(seconds))
+
+
+def _crawl_time():
+    """Current UTC time as "YYYY-MM-DD HH:MM:SS".
+
+    The string is only formatted once per second, however many pages are
+    crawled within it.
+    """
+    return _format_crawl_time(int(time.time()))
+
+
+def _literal_arg(value):
+    """Convert a spider argument passed as a string with ``-a`` to its value."""
+    return ast.literal_eval(value) if isinstance(value, str) else value
+
+
+# the namespaces that parsel makes available to selectors
+_SELECTOR_NAMESPACES = {
+    "re": "http://exslt.org/regular-expressions",
+    "set": "http://exslt.org/sets",
+}
+
+
+def _compile_selectors(selectors, css=False):
+    """Compile user-supplied selectors once, translating CSS to XPath first."""
+    if not selectors:
+        return {}
+    return {
+        key: etree.XPath(
+            css2xpath(selector) if css else selector,
+            namespaces=_SELECTOR_NAMESPACES,
+        )
+        for key, selector in selectors.items()
+    }
+
+
+def _selector_result_to_str(result):
+    # same serialization as parsel's Selector.get for HTML
+    try:
+        return etree.tostring(
+            result, method="html", encoding="unicode", with_tail=False
+        )
+    except (AttributeError, TypeError):
+        if result is True:
+            return "1"
+        elif result is False:
+            return "0"
         else:
-            value = "@@".join([h.root.text_content() for h in resp.xpath(xpath)])
-            if value:
-                d.update({tag: value})
+            return str(result)
+
+
+def _extract_selectors(root, compiled_selectors):
+    d = {}
+    for key, xpath in compiled_selectors.items():
+        result = xpath(root)
+        if not isinstance(result, list):
+            result = [result]
+        value = "@@".join([_selector_result_to_str(r) for r in result])
+        if value:
+            d[key] = value
     return d
 
 
@@ -680,7 +1102,7 @@ class SEOSitemapSpider(Spider):
 
     def __init__(
         self,
-        url_list,
+        url_list=None,
         follow_links=False,
         allowed_domains=None,
         exclude_url_params=None,
@@ -690,24 +1112,58 @@ class SEOSitemapSpider(Spider):
         css_selectors=None,
         xpath_selectors=None,
         meta=None,
+        url_list_file=None,
+        allowed_domains_file=None,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
-        self.start_urls = json.loads(json.dumps(url_list.split(",")))
-        self.allowed_domains = json.loads(json.dumps(allowed_domains.split(",")))
-        self.follow_links = eval(json.loads(json.dumps(follow_links)))
-        self.exclude_url_params = eval(json.loads(json.dumps(exclude_url_params)))
-        self.include_url_params = eval(json.loads(json.dumps(include_url_params)))
-        self.exclude_url_regex = str(json.loads(json.dumps(exclude_url_regex)))
+        if url_list_file is not None:
+            self.start_urls = _read_list_file(url_list_file)
+        else:
+            self.start_urls = url_list.split(",")
+        if allowed_domains_file is not None:
+            self.allowed_domains = _read_list_file(allowed_domains_file)
+        else:
+            self.allowed_domains = allowed_domains.split(",")
+        self.follow_links = _literal_arg(follow_links)
+        self.exclude_url_params = _literal_arg(exclude_url_params)
+        self.include_url_params = _literal_arg(include_url_params)
+        if self.exclude_url_params is not None and self.exclude_url_params is not True:
+            self.exclude_url_params = frozenset(self.exclude_url_params)
+        if self.include_url_params is not None:
+            self.include_url_params = frozenset(self.include_url_params)
+        self.exclude_url_regex = str(exclude_url_regex)
         if self.exclude_url_regex == "None":
             self.exclude_url_regex = None
-        self.include_url_regex = str(json.loads(json.dumps(include_url_regex)))
+        else:
+            self.exclude_url_regex = re.compile(self.exclude_url_regex)
+        self.include_url_regex = str(include_url_regex)
         if self.include_url_regex == "None":
             self.include_url_regex = None
-        self.css_selectors = eval(json.loads(json.dumps(css_selectors)))
-        self.xpath_selectors = eval(json.loads(json.dumps(xpath_selectors)))
-        self.meta = eval(json.loads(json.dumps(meta)))
+        else:
+            self.include_url_regex = re.compile(self.include_url_regex)
+        self.css_selectors = _literal_arg(css_selectors)
+        self.xpath_selectors = _literal_arg(xpath_selectors)
+        self.meta = _literal_arg(meta)
+        self.compiled_css_selectors = _compile_selectors(self.css_selectors, css=True)
+        self.compiled_xpath_selectors = _compile_selectors(self.xpath_selectors)
+        # the same links (navigation, footer, etc.) are found on most pages, so
+        # remember the decision for each URL instead of re-evaluating the rules
+        self.crawl_or_not = lru_cache(maxsize=65536)(
+            partial(
+                _crawl_or_not,
+                exclude_url_params=self.exclude_url_params,
+                include_url_params=self.include_url_params,
+                exclude_url_regex=self.exclude_url_regex,
+                include_url_regex=self.include_url_regex,
+            )
+        )
+        # custom_headers are only needed to build requests, keep them out of the
+        # meta that every request carries (and copies)
+        self.request_meta = {
+            k: v for k, v in (self.meta or {}).items() if k != "custom_headers"
+        }
 
     def get_custom_headers(self):
         if self.meta:
@@ -727,7 +1183,7 @@ class SEOSitemapSpider(Spider):
                     url,
                     callback=self.parse,
                     errback=self.errback,
-                    meta=self.meta,
+                    meta=self.request_meta,
                     headers=self.custom_headers.get(url),
                 )
             except Exception as e:
@@ -738,116 +1194,41 @@ class SEOSitemapSpider(Spider):
             self.logger.error(repr(failure))
             yield {
                 "url": failure.request.url,
-                "crawl_time": datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+                "crawl_time": _crawl_time(),
                 "errors": repr(failure),
             }
 
     def parse(self, response):
-        links = le.extract_links(response)
-        nav_links = le_nav.extract_links(response)
-        header_links = le_header.extract_links(response)
-        footer_links = le_footer.extract_links(response)
+        root = response.selector.root
+        page_links = le.extract_page_links(response)
+        links = page_links["links"]
+        nav_links = page_links["nav"]
+        header_links = page_links["header"]
+        footer_links = page_links["footer"]
         images = _extract_images(response)
 
-        if links:
-            parsed_links = dict(
-                links_url="@@".join(link.url for link in links),
-                links_text="@@".join(link.text for link in links),
-                links_nofollow="@@".join(str(link.nofollow) for link in links),
-            )
-        else:
-            parsed_links = {}
-        if nav_links:
-            parsed_nav_links = dict(
-                nav_links_url="@@".join(link.url for link in nav_links),
-                nav_links_text="@@".join(link.text for link in nav_links),
-                nav_links_nofollow="@@".join(str(link.nofollow) for link in nav_links),
-            )
-        else:
-            parsed_nav_links = {}
-        if header_links:
-            parsed_header_links = dict(
-                header_links_url="@@".join(link.url for link in header_links),
-                header_links_text="@@".join(link.text for link in header_links),
-                header_links_nofollow="@@".join(
-                    str(link.nofollow) for link in header_links
-                ),
-            )
-        else:
-            parsed_header_links = {}
-        if footer_links:
-            parsed_footer_links = dict(
-                footer_links_url="@@".join(link.url for link in footer_links),
-                footer_links_text="@@".join(link.text for link in footer_links),
-                footer_links_nofollow="@@".join(
-                    str(link.nofollow) for link in footer_links
-                ),
-            )
-        else:
-            parsed_footer_links = {}
-        if self.css_selectors:
-            css_selectors = {
-                key: "@@".join(response.css("{}".format(val)).getall())
-                for key, val in self.css_selectors.items()
-            }
-            css_selectors = {k: v for k, v in css_selectors.items() if v}
-        else:
-            css_selectors = {}
-
-        if self.xpath_selectors:
-            xpath_selectors = {
-                key: "@@".join(response.xpath("{}".format(val)).getall())
-                for key, val in self.xpath_selectors.items()
-            }
-            xpath_selectors = {k: v for k, v in xpath_selectors.items() if v}
-        else:
-            xpath_selectors = {}
-        canonical = {
-            "canonical": "@@".join(
-                response.css('link[rel="canonical"]::attr(href)').getall()
-            )
-        }
-        canonical = canonical if canonical.get("canonical") else {}
-        alt_href = {
-            "alt_href": "@@".join(
-                response.css("link[rel=alternate]::attr(href)").getall()
-            )
-        }
-        alt_href = alt_href if alt_href.get("alt_href") else {}
-        alt_hreflang = {
-            "alt_hreflang": "@@".join(
-                response.css("link[rel=alternate]::attr(hreflang)").getall()
-            )
-        }
-        alt_hreflang = alt_hreflang if alt_hreflang.get("alt_hreflang") else {}
-        og_props = response.xpath(
-            '//meta[starts-with(@property, "og:")]/@property'
-        ).getall()
-        og_content = response.xpath(
-            '//meta[starts-with(@property, "og:")]/@content'
-        ).getall()
+        parsed_links = _flatten_links(links, "links")
+        parsed_nav_links = _flatten_links(nav_links, "nav_links")
+        parsed_header_links = _flatten_links(header_links, "header_links")
+        parsed_footer_links = _flatten_links(footer_links, "footer_links")
+        css_selectors = _extract_selectors(root, self.compiled_css_selectors)
+        xpath_selectors = _extract_selectors(root, self.compiled_xpath_selectors)
+        head_tags = _extract_head_tags(root)
+        og_props = head_tags["og_props"]
+        og_content = head_tags["og_content"]
         if og_props and og_content:
             og_props = _numbered_duplicates(og_props)
             open_graph = dict(zip(og_props, og_content))
         else:
             open_graph = {}
-        twtr_names = response.xpath(
-            '//meta[starts-with(@name, "twitter:")]/@name'
-        ).getall()
-        twtr_content = response.xpath(
-            '//meta[starts-with(@name, "twitter:")]/@content'
-        ).getall()
+        twtr_names = head_tags["twtr_names"]
+        twtr_content = head_tags["twtr_content"]
         if twtr_names and twtr_content:
             twtr_card = dict(zip(twtr_names, twtr_content))
         else:
             twtr_card = {}
         try:
-            ld = [
-                json.loads(s.replace("\r", "").replace("\n", " "))
-                for s in response.css(
-                    'script[type="application/ld+json"]::text'
-                ).getall()
-            ]
+            ld = [_load_jsonld(s) for s in head_tags["jsonld"]]
             if not ld:
                 jsonld = {}
             else:
@@ -865,60 +1246,112 @@ class SEOSitemapSpider(Spider):
             self.logger.exception(
                 " ".join([str(e), str(response.status), response.url])
             )
-        page_content = _extract_content(response, **tags_xpaths)
-        yield dict(
-            url=response.request.url,
-            **page_content,
-            **open_graph,
-            **twtr_card,
-            **jsonld,
-            body_text=" ".join(response.xpath(BODY_TEXT_SELECTOR).extract()),
-            size=len(response.body),
-            **css_selectors,
-            **xpath_selectors,
-            **{
-                k: "@@".join(str(val) for val in v) if isinstance(v, list) else v
-                for k, v in response.meta.items()
-                if k != "custom_headers"
-            },
-            status=response.status,
-            **parsed_links,
-            **parsed_nav_links,
-            **parsed_header_links,
-            **parsed_footer_links,
-            **images,
-            ip_address=str(response.ip_address),
-            crawl_time=datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-            **{
-                "resp_headers_" + k: v
-                for k, v in response.headers.to_unicode_dict().items()
-            },
-            **{
-                "request_headers_" + k: v
-                for k, v in response.request.headers.to_unicode_dict().items()
-            },
-        )
+        record = {"url": response.request.url}
+        record.update(_extract_content(root, head_tags))
+        record.update(open_graph)
+        record.update(twtr_card)
+        record.update(jsonld)
+        record["body_text"] = " ".join(_extract_body_text(root))
+        record["size"] = len(response.body)
+        record.update(css_selectors)
+        record.update(xpath_selectors)
+        record.update(_meta_to_dict(response.meta))
+        record["status"] = response.status
+        record.update(parsed_links)
+        record.update(parsed_nav_links)
+        record.update(parsed_header_links)
+        record.update(parsed_footer_links)
+        record.update(images)
+        record["ip_address"] = str(response.ip_address)
+        record["crawl_time"] = _crawl_time()
+        record.update(_headers_to_dict(response.headers, "resp_headers_"))
+        record.update(_headers_to_dict(response.request.headers, "request_headers_"))
+        yield record
         if self.follow_links:
             next_pages = [link.url for link in links]
             if next_pages:
                 for page in next_pages:
-                    cond = _crawl_or_not(
-                        page,
-                        exclude_url_params=self.exclude_url_params,
-                        include_url_params=self.include_url_params,
-                        exclude_url_regex=self.exclude_url_regex,
-                        include_url_regex=self.include_url_regex,
-                    )
-                    if cond:
+                    if self.crawl_or_not(page):
                         yield Request(
                             page,
                             callback=self.parse,
                             errback=self.errback,
-                            meta=self.meta,
+                            meta=self.request_meta,
                             headers=self.custom_headers.get(page),
                         )
 
 
+def _validate_crawl_args(
+    output_file,
+    xpath_selectors,
+    css_selectors,
+    exclude_url_params,
+    include_url_params,
+    exclude_url_regex,
+    include_url_regex,
+    meta=None,
+):
+    """Raise a ValueError for invalid or conflicting arguments of ``crawl``."""
+    if not output_file.endswith((".jl", ".jsonl")):
+        raise ValueError(
+            "Please make sure your output_file ends with '.jl' or '.jsonl'.\n"
+            "For example:\n"
+            "{}.jl".format(os.path.splitext(output_file)[0])
+        )
+    if (xpath_selectors is not None) and (css_selectors is not None):
+        css_xpath = xpath_selectors.keys() & css_selectors.keys()
+        if css_xpath:
+            raise ValueError(
+                "Please make sure you don't set common keys for"
+                "`css_selectors` and `xpath_selectors`.\n"
+                "Duplicated keys: {}".format(css_xpath)
+            )
+    reserved_prefixes = ", ".join(_PAGE_COLUMN_PREFIXES)
+    selector_keys = (xpath_selectors or {}).keys() | (css_selectors or {}).keys()
+    selector_clashes = _page_column_clashes(selector_keys)
+    if selector_clashes:
+        raise ValueError(
+            "Please make sure you don't use names of default headers as "
+            "selector keys.\n"
+            "Conflicting keys: {}\n"
+            "Keys also can't start with: {}".format(selector_clashes, reserved_prefixes)
+        )
+    if meta:
+        meta_keys = meta.keys() - _META_COLUMNS - {"custom_headers"}
+        # selector values would overwrite meta values of the same name
+        meta_clashes = sorted(
+            set(_page_column_clashes(meta_keys)) | (meta_keys & selector_keys)
+        )
+        if meta_clashes:
+            raise ValueError(
+                "Please make sure your `meta` keys don't overwrite columns "
+                "extracted from the crawled pages or your selector keys.\n"
+                "Conflicting keys: {}\n"
+                "Keys also can't start with: {}".format(meta_clashes, reserved_prefixes)
+            )
+    if exclude_url_params is not None and include_url_params is not None:
+        if exclude_url_params is True:
+            raise ValueError(
+                "Please make sure you don't exclude and include "
+                "parameters at the same time."
+            )
+        common_params = set(exclude_url_params).intersection(include_url_params)
+        if common_params:
+            raise ValueError(
+                f"Please make sure you don't include and exclude "
+                f"the same parameters.\n"
+                f"Common parameters entered: "
+                f"{', '.join(common_params)}"
+            )
+    if include_url_regex is not None and exclude_url_regex is not None:
+        if include_url_regex == exclude_url_regex:
+            raise ValueError(
+                f"Please make sure you don't include and exclude "
+                f"the same regex pattern.\n"
+                f"You entered '{include_url_regex}'."
+            )
+
+
 def crawl(
     url_list,
     output_file,
@@ -978,7 +1411,9 @@ def crawl(
       documentation.
     meta : dict
       Additional data to pass to the crawler; add arbitrary metadata, set custom request
-      headers per URL, and/or enable some third party plugins.
+      headers per URL, and/or enable some third party plugins. Keys can't be names
+      of columns extracted from the crawled pages (e.g. "title" or "h1"), or keys
+      of ``css_selectors`` or ``xpath_selectors``.
     Examples
     --------
     Crawl a website and let the crawler discover as many pages as available
@@ -1105,92 +1540,56 @@ def crawl(
         url_list = [url_list]
     if isinstance(allowed_domains, str):
         allowed_domains = [allowed_domains]
-    if output_file.rsplit(".")[-1] not in ["jl", "jsonl"]:
-        raise ValueError(
-            "Please make sure your output_file ends with '.jl' or '.jsonl'.\n"
-            "For example:\n"
-            "{}.jl".format(output_file.rsplit(".", maxsplit=1)[0])
-        )
-    if (xpath_selectors is not None) and (css_selectors is not None):
-        css_xpath = set(xpath_selectors).intersection(css_selectors)
-        if css_xpath:
-            raise ValueError(
-                "Please make sure you don't set common keys for"
-                "`css_selectors` and `xpath_selectors`.\n"
-                "Duplicated keys: {}".format(css_xpath)
-            )
-    for selector in [xpath_selectors, css_selectors]:
-        if selector is not None and set(selector).intersection(crawl_headers):
-            raise ValueError(
-                "Please make sure you don't use names of default "
-                "headers. Avoid using any of these as keys: \n"
-                "{}".format(sorted(crawl_headers))
-            )
+    _validate_crawl_args(
+        output_file,
+        xpath_selectors,
+        css_selectors,
+        exclude_url_params,
+        include_url_params,
+        exclude_url_regex,
+        include_url_regex,
+        meta,
+    )
     if allowed_domains is None:
-        allowed_domains = {urlparse(url).netloc for url in url_list}
-    if exclude_url_params is not None and include_url_params is not None:
-        if exclude_url_params is True:
-            raise ValueError(
-                "Please make sure you don't exclude and include "
-                "parameters at the same time."
-            )
-        common_params = set(exclude_url_params).intersection(include_url_params)
-        if common_params:
-            raise ValueError(
-                f"Please make sure you don't include and exclude "
-                f"the same parameters.\n"
-                f"Common parameters entered: "
-                f"{', '.join(common_params)}"
-            )
-    if include_url_regex is not None and exclude_url_regex is not None:
-        if include_url_regex == exclude_url_regex:
-            raise ValueError(
-                f"Please make sure you don't include and exclude "
-                f"the same regex pattern.\n"
-                f"You entered '{include_url_regex}'."
-            )
+        allowed_domains = {urlsplit(url).netloc for url in url_list}
 
     settings_list = []
     if custom_settings is not None:
         for key, val in custom_settings.items():
             if isinstance(val, (dict, list, set, tuple)):
-                setting = "=".join([key, json.dumps(val)])
-            else:
-                setting = "=".join([key, str(val)])
-            settings_list.extend(["-s", setting])
-
-    command = [
-        "scrapy",
-        "runspider",
-        spider_path,
-        "-a",
-        "url_list=" + ",".join(url_list),
-        "-a",
-        "allowed_domains=" + ",".join(allowed_domains),
-        "-a",
-        "follow_links=" + str(follow_links),
-        "-a",
-        "exclude_url_params=" + str(exclude_url_params),
-        "-a",
-        "include_url_params=" + str(include_url_params),
-        "-a",
-        "exclude_url_regex=" + str(exclude_url_regex),
-        "-a",
-        "include_url_regex=" + str(include_url_regex),
-        "-a",
-        "css_selectors=" + str(css_selectors),
-        "-a",
-        "xpath_selectors=" + str(xpath_selectors),
-        "-a",
-        "meta=" + str(meta),
-        "-o",
-        output_file,
-    ] + settings_list
-    if len(",".join(url_list)) > MAX_CMD_LENGTH:
-        split_urls = _split_long_urllist(url_list)
-
-        for u_list in split_urls:
-            command[4] = "url_list=" + ",".join(u_list)
-            subprocess.run(command)
-    else:
+                val = json.dumps(val)
+            settings_list.extend(["-s", f"{key}={val}"])
+
+    spider_args = {
+        "follow_links": follow_links,
+        "exclude_url_params": exclude_url_params,
+        "include_url_params": include_url_params,
+        "exclude_url_regex": exclude_url_regex,
+        "include_url_regex": include_url_regex,
+        "css_selectors": css_selectors,
+        "xpath_selectors": xpath_selectors,
+        "meta": meta,
+    }
+    command = ["scrapy", "runspider", spider_path]
+    for name, value in spider_args.items():
+        command.extend(["-a", f"{name}={value}"])
+    command.extend(["-o", output_file])
+    command.extend(settings_list)
+    list_args = {"url_list": url_list, "allowed_domains": allowed_domains}
+    list_command = []
+    for name, values in list_args.items():
+        list_command.extend(["-a", f"{name}={','.join(values)}"])
+    command_len = sum(len(arg) + 1 for arg in command + list_command)
+    if command_len <= MAX_CMD_LENGTH:
+        subprocess.run(command + list_command)
+        return
+    # too long for the command line: pass the URLs and domains in files, so
+    # that a single Scrapy process crawls all of them
+    list_files = {name: _write_list_file(values) for name, values in list_args.items()}
+    try:
+        for name, filepath in list_files.items():
+            command.extend(["-a", f"{name}_file={filepath}"])
         subprocess.run(command)
+    finally:
+        for filepath in list_files.values():
+            os.remove(filepath)
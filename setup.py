@@ -14,9 +14,11 @@ with open("HISTORY.rst") as history_file:
     history = history_file.read()
 
 requirements = [
+    "lxml>=4.4.1",
     "pandas>=1.1.0",
+    "parsel>=1.5.0",
     "pyasn1>=0.4",
-    "scrapy>=2.5.0",
+    "scrapy>=2.10.0",
     "twython>=3.8.0",
     "pyarrow>=5.0.0",
 ]
@@ -196,3 +196,29 @@ with TemporaryDirectory() as meta_parameter_dir:
         assert "request_headers_If-None-Match" in crawl_df
         assert crawl_df["foo"][0] == "bar"
         assert crawl_df["request_headers_Blah"][0] == "blew"
+
+
+with TemporaryDirectory() as long_url_list_dir:
+
+    def test_url_list_longer_than_command_line_is_crawled():
+        long_url_list = [
+            f"{links_file.as_uri()}?page={i}&q={'x' * 20_000}" for i in range(6)
+        ]
+        crawl(
+            long_url_list,
+            f"{long_url_list_dir}/long_url_list.jl",
+            custom_settings={"ROBOTSTXT_OBEY": False},
+        )
+        crawl_df = pd.read_json(f"{long_url_list_dir}/long_url_list.jl", lines=True)
+        assert sorted(crawl_df["url"]) == sorted(long_url_list)
+
+    def test_many_allowed_domains_are_passed_to_the_crawler():
+        allowed_domains = [""] + [f"www{i}.example.com" for i in range(12_000)]
+        crawl(
+            links_file.as_uri(),
+            f"{long_url_list_dir}/many_domains.jl",
+            allowed_domains=allowed_domains,
+            custom_settings={"ROBOTSTXT_OBEY": False},
+        )
+        crawl_df = pd.read_json(f"{long_url_list_dir}/many_domains.jl", lines=True)
+        assert crawl_df["url"].tolist() == [links_file.as_uri()]
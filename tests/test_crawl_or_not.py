@@ -1,6 +1,8 @@
+import re
+
 import pytest
 
-from advertools.spider import _crawl_or_not
+from advertools.spider import SEOSitemapSpider, _crawl_or_not
 
 url = "https://example.com"
 
@@ -66,3 +68,26 @@ def test_include_regex():
 def test_multi_condition():
     result = _crawl_or_not(url, exclude_url_params=True, include_url_regex="example")
     assert result
+
+
+def test_compiled_regex():
+    assert not _crawl_or_not(url, exclude_url_regex=re.compile("https:.*ple"))
+    assert _crawl_or_not(url, include_url_regex=re.compile("https:.*ple"))
+
+
+def test_spider_caches_crawl_or_not_decisions():
+    spider = SEOSitemapSpider(
+        url_list=url,
+        allowed_domains="example.com",
+        follow_links="True",
+        exclude_url_params="['one']",
+        include_url_params="None",
+        exclude_url_regex="/private/",
+        include_url_regex="None",
+        css_selectors="None",
+        xpath_selectors="None",
+        meta="None",
+    )
+    urls = [url + "?one=1", url + "/private/page", url + "/page?two=2"] * 2
+    assert [spider.crawl_or_not(u) for u in urls] == [False, False, True] * 2
+    assert spider.crawl_or_not.cache_info().hits == 3
@@ -224,6 +224,43 @@ def test_jl_to_parquet_correct_columns():
         assert set(jl_df.columns) == set(pq_cols["column"])
 
 
+def test_jl_to_parquet_mixed_type_column():
+    with TemporaryDirectory() as tempdir:
+        mixed_df = pd.DataFrame(
+            {
+                "url": [
+                    "https://example.com/a",
+                    "https://example.com/b",
+                    "https://example.com/c",
+                    "https://example.com/d",
+                ],
+                "jsonld_price": [10, "ten", None, "nan"],
+            }
+        )
+        mixed_df.to_json(f"{tempdir}/mixed.jl", orient="records", lines=True)
+        crawlytics.jl_to_parquet(f"{tempdir}/mixed.jl", f"{tempdir}/mixed.parquet")
+        pq_df = pd.read_parquet(f"{tempdir}/mixed.parquet")
+        assert pq_df["jsonld_price"].tolist() == ["10", "ten", None, "nan"]
+
+
+def test_jl_to_parquet_nested_mixed_type_column_keeps_nulls():
+    with TemporaryDirectory() as tempdir:
+        nested_df = pd.DataFrame(
+            {
+                "url": [
+                    "https://example.com/a",
+                    "https://example.com/b",
+                    "https://example.com/c",
+                ],
+                "nested": [[1, "a"], None, [2]],
+            }
+        )
+        nested_df.to_json(f"{tempdir}/nested.jl", orient="records", lines=True)
+        crawlytics.jl_to_parquet(f"{tempdir}/nested.jl", f"{tempdir}/nested.parquet")
+        pq_df = pd.read_parquet(f"{tempdir}/nested.parquet")
+        assert pq_df["nested"].tolist() == ["[1, 'a']", None, "[2]"]
+
+
 def test_compare_numeric():
     result = crawlytics.compare(df1, df2, "size")
     assert result.columns.tolist() == ["url", "size_x", "size_y", "diff", "diff_perc"]
@@ -10,6 +10,15 @@ def test_crawl_headers_raises_on_wrong_file_extension():
         crawl_headers("https://example.com", "myfile.wrong")
 
 
+def test_crawl_headers_raises_when_settings_fill_the_command_line():
+    with pytest.raises(ValueError):
+        crawl_headers(
+            "https://example.com",
+            "output.jl",
+            custom_settings={"DEFAULT_REQUEST_HEADERS": {"X-Long": "x" * 200_000}},
+        )
+
+
 @pytest.mark.parametrize("column", ["url", "crawl_time", "status"])
 @pytest.mark.skipif(platform.system() == "Windows", reason="Skip if on Windows")
 def test_crawl_headers_returns_df(headers_crawl_df, column):
@@ -1,15 +1,34 @@
+import datetime
+import json
 import os
 import random
 from collections import Counter
 
 import pytest
-from scrapy.http import HtmlResponse, Request
+from pandas import json_normalize
+from scrapy.http import Headers, HtmlResponse, Request
 
 from advertools.spider import (
+    BODY_TEXT_SELECTOR,
+    MyLinkExtractor,
+    SEOSitemapSpider,
+    _compile_selectors,
+    _crawl_time,
+    _extract_body_text,
+    _extract_content,
+    _extract_head_tags,
     _extract_images,
+    _extract_selectors,
+    _flatten_links,
+    _headers_to_dict,
     _json_to_dict,
+    _literal_arg,
+    _load_jsonld,
+    _meta_to_dict,
     _numbered_duplicates,
     _split_long_urllist,
+    _validate_crawl_args,
+    _write_list_file,
     crawl,
 )
 
@@ -63,6 +82,17 @@ def test_numbered_duplicates_returns_correct_items():
         assert Counter(sample) == Counter(result_split)
 
 
+def test_numbered_duplicates_keeps_first_occurrence():
+    items = ["og:site", "og:image", "og:image", "og:type", "og:image"]
+    assert _numbered_duplicates(items) == [
+        "og:site",
+        "og:image",
+        "og:image_1",
+        "og:type",
+        "og:image_2",
+    ]
+
+
 def test_json_to_dict_returns_dict():
     result = _json_to_dict(jsonobj)
     assert isinstance(result, dict)
@@ -77,6 +107,23 @@ def test_json_to_dict_contains_number():
         assert all(to_test in key for key in result)
 
 
+@pytest.mark.parametrize(
+    "obj",
+    [
+        jsonobj,
+        [jsonobj, {"@type": "Person", "logo": {"height": 2.5}, "award": True}],
+        {"@type": "Offer", "price": 10, "inStock": True, "seller": {"rating": None}},
+    ],
+)
+def test_json_to_dict_matches_json_normalize(obj):
+    df = json_normalize(obj).add_prefix("jsonld_")
+    expected = dict(zip(df.columns, df.values[0]))
+    result = _json_to_dict(obj)
+    assert list(result) == list(expected)
+    for key, value in expected.items():
+        assert result[key] == value or (value != value and result[key] != result[key])
+
+
 def test_crawl_raises_on_wrong_file_extension():
     with pytest.raises(ValueError):
         crawl("https://example.com", "myfile.wrong", allowed_domains="example.com")
@@ -89,9 +136,306 @@ def test_split_long_urllist_correct_lengths():
     assert all(len(x) < 15 for x in result)
 
 
+def test_split_long_urllist_counts_separators():
+    urls = ["https://example.com/" + str(i) for i in range(100)]
+    result = _split_long_urllist(urls, max_len=100)
+    assert [url for chunk in result for url in chunk] == urls
+    assert all(len(",".join(chunk)) < 100 for chunk in result)
+
+
+def test_split_long_urllist_oversized_first_url():
+    urls = ["https://a.com/" + "x" * 50, "https://b.com"]
+    assert _split_long_urllist(urls, max_len=20) == [[urls[0]], [urls[1]]]
+    assert _split_long_urllist(urls, max_len=0) == [[urls[0]], [urls[1]]]
+
+
 def test_extract_images(html_file="tests/data/crawl_testing/test_images.html"):
     response = response_from_file(html_file)
     imgs_dict = _extract_images(response)
     for k, v in imgs_dict.items():
         assert len(v.split("@@")) == 3
     assert imgs_dict["img_src"] == "@@https://example.com/image.png@@"
+
+
+def test_headers_to_dict_matches_to_unicode_dict():
+    headers = Headers(
+        {
+            "Content-Type": "text/html",
+            "set-cookie": ["a=1", "b=2"],
+            "X-Custom": "value",
+        }
+    )
+    result = _headers_to_dict(headers, "resp_headers_")
+    expected = {"resp_headers_" + k: v for k, v in headers.to_unicode_dict().items()}
+    assert result == expected
+    assert result["resp_headers_Set-Cookie"] == "a=1,b=2"
+
+
+def test_headers_to_dict_keeps_scrapy_key_casing():
+    headers = Headers({"content-type": "text/html", "x-ms-request-id": "1"})
+    assert list(_headers_to_dict(headers, "resp_headers_")) == [
+        "resp_headers_Content-Type",
+        "resp_headers_X-Ms-Request-Id",
+    ]
+
+
+def test_meta_to_dict_joins_lists():
+    meta = {
+        "depth": 1,
+        "redirect_urls": ["https://example.com", "https://example.com/"],
+        "redirect_reasons": [301, 302],
+        "foo": "bar",
+    }
+    assert _meta_to_dict(meta) == {
+        "depth": 1,
+        "redirect_urls": "https://example.com@@https://example.com/",
+        "redirect_reasons": "301@@302",
+        "foo": "bar",
+    }
+
+
+def test_extract_links_keeps_restrict_xpaths_order():
+    response = response_from_file("tests/data/crawl_testing/test_content.html")
+    restricted = MyLinkExtractor(unique=False, restrict_xpaths=["//footer", "//nav"])
+    section_links = MyLinkExtractor(unique=False).extract_section_links(response)
+    assert restricted.extract_links(response) == (
+        section_links["footer"] + section_links["nav"]
+    )
+
+
+def test_extract_section_links_matches_restricted_extractors():
+    response = response_from_file("tests/data/crawl_testing/test_content.html")
+    section_links = MyLinkExtractor(unique=False).extract_section_links(response)
+    for section in ["nav", "header", "footer"]:
+        restricted = MyLinkExtractor(unique=False, restrict_xpaths=f"//{section}")
+        assert section_links[section] == restricted.extract_links(response)
+        assert len(section_links[section]) == 3
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<html><body>x<p>a<!-- c -->b<svg><p>z</p></svg>c</p>"
+        "<div>d<span>e</span>f<table><tr><td><p>no</p></td></tr></table>g</div>"
+        "<nav><p>menu</p></nav><footer><p>foot</p></footer></body></html>",
+        "<html><head><title>title</title></head></html>",
+        open("tests/data/crawl_testing/test_content.html").read(),
+    ],
+)
+def test_extract_body_text_matches_body_text_selector(html):
+    response = HtmlResponse(url="https://example.com", body=html, encoding="utf-8")
+    expected = response.xpath(BODY_TEXT_SELECTOR).getall()
+    assert _extract_body_text(response.selector.root) == expected
+
+
+def test_flatten_links():
+    response = response_from_file("tests/data/crawl_testing/test_content.html")
+    links = MyLinkExtractor(unique=False).extract_links(response)
+    result = _flatten_links(links, "links")
+    assert result == {
+        "links_url": "@@".join(link.url for link in links),
+        "links_text": "@@".join(link.text for link in links),
+        "links_nofollow": "@@".join(str(link.nofollow) for link in links),
+    }
+    assert _flatten_links([], "nav_links") == {}
+
+
+def test_extract_images_without_attributes():
+    response = HtmlResponse(
+        url="https://example.com",
+        body="<html><body><img><img data-x='1'></body></html>",
+        encoding="utf-8",
+    )
+    assert _extract_images(response) == {}
+
+
+def test_compiled_selectors_match_response_selectors():
+    response = response_from_file("tests/data/crawl_testing/test_content.html")
+    css_selectors = {"links": "a::attr(href)", "h2": "h2", "missing": "blink"}
+    xpath_selectors = {"links": "//a/@href", "count": "count(//a)", "h2": "//h2"}
+    css_result = _extract_selectors(
+        response.selector.root, _compile_selectors(css_selectors, css=True)
+    )
+    xpath_result = _extract_selectors(
+        response.selector.root, _compile_selectors(xpath_selectors)
+    )
+    assert css_result == {
+        key: "@@".join(response.css(val).getall())
+        for key, val in css_selectors.items()
+        if response.css(val)
+    }
+    assert xpath_result == {
+        key: "@@".join(response.xpath(val).getall())
+        for key, val in xpath_selectors.items()
+    }
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("True", True),
+        ("None", None),
+        ("['a', 'b']", ["a", "b"]),
+        ("{'price': '.price::text'}", {"price": ".price::text"}),
+        (None, None),
+        (False, False),
+    ],
+)
+def test_literal_arg(value, expected):
+    assert _literal_arg(value) == expected
+
+
+def test_literal_arg_rejects_expressions():
+    with pytest.raises(ValueError):
+        _literal_arg("__import__('os').getcwd()")
+
+
+def test_crawl_time_format():
+    crawl_time = _crawl_time()
+    parsed = datetime.datetime.strptime(crawl_time, "%Y-%m-%d %H:%M:%S")
+    assert parsed.strftime("%Y-%m-%d %H:%M:%S") == crawl_time
+
+
+def test_extract_page_links_matches_separate_extractors():
+    response = response_from_file("tests/data/crawl_testing/test_content.html")
+    extractor = MyLinkExtractor(unique=False)
+    page_links = extractor.extract_page_links(response)
+    assert page_links["links"] == extractor.extract_links(response)
+    section_links = extractor.extract_section_links(response)
+    for section in ["nav", "header", "footer"]:
+        assert page_links[section] == section_links[section]
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        '{"@type": "Article",\r\n "name": "one\\ntwo"}',
+        '{"@type": "Article", "name": "raw\nline\r\nbreaks"}',
+    ],
+)
+def test_load_jsonld_matches_stripped_line_breaks(script):
+    expected = json.loads(script.replace("\r", "").replace("\n", " "))
+    assert _load_jsonld(script) == expected
+
+
+def test_load_jsonld_raises_on_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        _load_jsonld('{"@type": "Article",')
+
+
+def test_extract_content_matches_xpaths():
+    response = response_from_file("tests/data/crawl_testing/test_content.html")
+    content = _extract_content(response.selector.root)
+    assert content["title"] == "@@".join(response.xpath("//title/text()").getall())
+    for tag in ["h1", "h2", "h3", "h4", "h5", "h6"]:
+        expected = "@@".join(h.root.text_content() for h in response.xpath(f"//{tag}"))
+        assert content.get(tag, "") == expected
+    assert "h2" in content
+    assert "h1" not in content
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"output_file": "output.csv"},
+        {"css_selectors": {"price": ".price"}, "xpath_selectors": {"price": "//b"}},
+        {"css_selectors": {"title": "h1"}},
+        {"exclude_url_params": True, "include_url_params": ["page"]},
+        {"exclude_url_params": ["page"], "include_url_params": ["page"]},
+        {"exclude_url_regex": "shop", "include_url_regex": "shop"},
+        {"css_selectors": {"og:title": "h1"}},
+        {"xpath_selectors": {"nav_links_url": "//nav//a/@href"}},
+        {"meta": {"title": "My title"}},
+        {"meta": {"body_text": "text", "custom_headers": {}}},
+        {"meta": {"jsonld_name": "name"}},
+        {"css_selectors": {"price": ".price"}, "meta": {"price": "10"}},
+    ],
+)
+def test_validate_crawl_args_raises(kwargs):
+    args = dict.fromkeys(
+        [
+            "xpath_selectors",
+            "css_selectors",
+            "exclude_url_params",
+            "include_url_params",
+            "exclude_url_regex",
+            "include_url_regex",
+        ]
+    )
+    args["output_file"] = "output.jl"
+    args.update(kwargs)
+    with pytest.raises(ValueError):
+        _validate_crawl_args(**args)
+
+
+def test_validate_crawl_args_names_conflicting_selector_keys():
+    with pytest.raises(ValueError, match=r"\['img_src', 'og:title'\]"):
+        _validate_crawl_args(
+            "output.jl",
+            {"og:title": "//title", "img_src": "//img/@src", "price": "//b"},
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+
+
+def test_validate_crawl_args_accepts_meta_keys():
+    _validate_crawl_args(
+        "output.jl",
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        meta={"foo": "bar", "download_timeout": 5, "custom_headers": {}},
+    )
+
+
+def test_extract_head_tags_matches_xpaths():
+    html = """<html><head><title>Title</title>
+    <meta name="description" content="desc"><meta charset="utf-8">
+    <meta name="viewport" content="width=device-width">
+    <meta property="og:image" content="one.png"><meta property="og:image">
+    <meta name="twitter:card" content="summary">
+    <link rel="canonical" href="https://example.com/">
+    <link rel="alternate" href="https://example.com/fr" hreflang="fr">
+    <link rel="alternate" hreflang="de">
+    <script type="application/ld+json">{"@type": "Thing"}</script>
+    </head><body><svg><title>icon</title></svg></body></html>"""
+    response = HtmlResponse(url="https://example.com", body=html, encoding="utf-8")
+    head_tags = _extract_head_tags(response.selector.root)
+    xpaths = {
+        "title": "//title/text()",
+        "meta_desc": '//meta[@name="description"]/@content',
+        "viewport": '//meta[@name="viewport"]/@content',
+        "charset": "//meta[@charset]/@charset",
+        "og_props": '//meta[starts-with(@property, "og:")]/@property',
+        "og_content": '//meta[starts-with(@property, "og:")]/@content',
+        "twtr_names": '//meta[starts-with(@name, "twitter:")]/@name',
+        "twtr_content": '//meta[starts-with(@name, "twitter:")]/@content',
+        "canonical": '//link[@rel="canonical"]/@href',
+        "alt_href": '//link[@rel="alternate"]/@href',
+        "alt_hreflang": '//link[@rel="alternate"]/@hreflang',
+        "jsonld": '//script[@type="application/ld+json"]/text()',
+    }
+    for key, xpath in xpaths.items():
+        assert head_tags[key] == response.xpath(xpath).getall()
+
+
+def test_list_files_keep_line_breaking_characters():
+    urls = ["https://example.com/a\rb", "https://example.com/\x85c\u2028d"]
+    domains = ["example.com", "www.example.com"]
+    url_list_file = _write_list_file(urls)
+    allowed_domains_file = _write_list_file(domains)
+    try:
+        spider = SEOSitemapSpider(
+            url_list_file=url_list_file, allowed_domains_file=allowed_domains_file
+        )
+    finally:
+        os.remove(url_list_file)
+        os.remove(allowed_domains_file)
+    assert spider.start_urls == urls
+    assert spider.allowed_domains == domains